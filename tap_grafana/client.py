@@ -8,9 +8,16 @@
 
 from __future__ import annotations
 
+import queue
 import sys
+import threading
+import time
 import requests
 
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError, as_completed
+from singer_sdk import metrics
+from singer_sdk.exceptions import RetriableAPIError
 from singer_sdk.streams import RESTStream
 from typing import Any, Callable, Iterable
 from singer_sdk.authenticators import APIKeyAuthenticator
@@ -19,6 +26,17 @@ from singer_sdk.pagination import BaseAPIPaginator, BaseHATEOASPaginator  # noqa
 
 from urllib.parse import urlparse, parse_qsl
 
+from tap_grafana.replay import ResponseArchive
+from tap_grafana.sampling import SampleStats
+from tap_grafana.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    CircuitState,
+    LatencyTracker,
+    ResilienceMetric,
+    get_circuit_breaker,
+)
+
 
 if sys.version_info >= (3, 9):
     import importlib.resources as importlib_resources
@@ -28,15 +46,153 @@ else:
 _Auth = Callable[[requests.PreparedRequest], requests.PreparedRequest]
 
 
+def decode_json(response: requests.Response) -> Any:  # noqa: ANN401
+    """Return the decoded JSON body of a response, decoding it only once.
+
+    The paginator and ``parse_response`` both need the page body, so the
+    decoded document is cached on the response object and shared.
+
+    Args:
+        response: The HTTP ``requests.Response`` object.
+
+    Returns:
+        The decoded JSON document.
+    """
+    body = getattr(response, "_grafana_json", None)
+    if body is None:
+        body = response.json()
+        response._grafana_json = body  # noqa: SLF001
+    return body
+
+
 class GrafanaPaginator(BaseHATEOASPaginator):
+    def __init__(self, max_pages: int | None = None) -> None:
+        super().__init__()
+        self.max_pages = max_pages
+
     def get_next_url(self, response):
-        data = response.json()
+        data = decode_json(response)
         return data.get("next")
 
+    def has_more(self, response: requests.Response) -> bool:  # noqa: ARG002
+        return self.max_pages is None or self.count < self.max_pages
+
+
+class RollingKeySet:
+    """Set of the most recently added keys, holding at most ``maxlen`` keys."""
+
+    def __init__(self, maxlen: int) -> None:
+        self.maxlen = maxlen
+        self._keys: OrderedDict[Any, None] = OrderedDict()
+
+    def add(self, key: Any) -> bool:  # noqa: ANN401
+        """Add a key, evicting the oldest one when the set is full.
+
+        Args:
+            key: The key to add.
+
+        Returns:
+            ``False`` if the key was already present, ``True`` otherwise.
+        """
+        if key in self._keys:
+            return False
+        self._keys[key] = None
+        if len(self._keys) > self.maxlen:
+            self._keys.popitem(last=False)
+        return True
+
 
 class GrafanaRestStream(RESTStream):
     """Grafana stream class."""
 
+    # Query parameters the OnCall endpoint filters on server-side. Filters
+    # configured in `stream_filters` for other fields are applied client-side.
+    filter_params: tuple[str, ...] = ()
+
+    # Set when the stream failed behind an open circuit and was deferred to the
+    # end of the run by `TapGrafana.sync_all`.
+    deferred = False
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Initialize the stream, applying the configured STATE cadence.
+
+        Args:
+            args: Positional arguments for ``RESTStream``.
+            kwargs: Keyword arguments for ``RESTStream``.
+        """
+        super().__init__(*args, **kwargs)
+        self.STATE_MSG_FREQUENCY = int(
+            self.config.get("state_message_frequency", self.STATE_MSG_FREQUENCY)
+        )
+        self._state_message_time = float("-inf")
+        self.latencies = LatencyTracker()
+        self.hedges_sent = 0
+        self.hedges_won = 0
+        self._hedge_executor: ThreadPoolExecutor | None = None
+        self.sample_stats: SampleStats | None = None
+
+    def _write_state_message(self) -> None:
+        """Write a STATE message, at most once per ``state_message_interval``.
+
+        Every STATE message carries the full state document, so with many
+        bookmarks frequent messages get expensive to serialize and log.
+        """
+        interval = self.config.get("state_message_interval", 0)
+        if interval and time.monotonic() - self._state_message_time < interval:
+            return
+        super()._write_state_message()
+        self._state_message_time = time.monotonic()
+
+    def sync(self, context: dict | None = None) -> None:
+        """Sync the stream, always ending with its latest STATE message.
+
+        If the sync fails with a transient API error or `CircuitOpenError`
+        while the endpoint's circuit breaker is open, the stream is marked as
+        deferred instead, so the rest of the run can go on.
+        A stream that fails again after being deferred raises. In sample mode
+        the stream's sample report is logged at the end.
+
+        Args:
+            context: The stream context.
+        """
+        if self._tap.sample_pages:
+            self.sample_stats = SampleStats(self.schema)
+        try:
+            super().sync(context)
+        except (
+            CircuitOpenError,
+            RetriableAPIError,
+            ConnectionResetError,
+            requests.exceptions.RequestException,
+        ):
+            breaker = self.circuit_breaker
+            if (
+                self.deferred
+                or breaker is None
+                or breaker.state is CircuitState.CLOSED
+            ):
+                raise
+            self.logger.warning(
+                "Circuit breaker for %s is open, deferring stream '%s' to the end "
+                "of the run",
+                breaker.endpoint,
+                self.name,
+            )
+            self.deferred = True
+            return
+        finally:
+            self._log_hedge_metrics()
+            if self._hedge_executor is not None:
+                self._hedge_executor.shutdown(wait=False)
+                self._hedge_executor = None
+
+        # The final STATE message of the stream must not be throttled away.
+        self._state_message_time = float("-inf")
+        self._write_state_message()
+
+        if self.sample_stats is not None:
+            self.sample_stats.log(self.logger, self.name)
+
     @property
     def url_base(self) -> str:
         """Return the API URL root, configurable via tap settings."""
@@ -46,6 +202,375 @@ class GrafanaRestStream(RESTStream):
 
     next_page_token_jsonpath = "$.next_page"  # noqa: S105
 
+    @property
+    def stream_filters(self) -> dict[str, Any]:
+        """Return the filters configured for this stream.
+
+        Returns:
+            A mapping of field or query parameter name to the wanted value, or
+            to a list of accepted values.
+        """
+        return self.config.get("stream_filters", {}).get(self.name, {})
+
+    @property
+    def client_filters(self) -> dict[str, tuple]:
+        """Return the configured filters the API cannot apply for this stream.
+
+        Filters on fields missing from the stream schema are ignored with a
+        warning, since they would otherwise drop every record.
+
+        Returns:
+            A mapping of record field to the accepted values. Record values are
+            compared by equality, as they may be unhashable objects or arrays.
+        """
+        if getattr(self, "_client_filters", None) is None:
+            self._client_filters = {}
+            for key, value in self.stream_filters.items():
+                if key in self.filter_params:
+                    continue
+                if key not in self.schema["properties"]:
+                    self.logger.warning(
+                        "Ignoring filter '%s' for stream '%s': it is neither an "
+                        "API filter nor a record field",
+                        key,
+                        self.name,
+                    )
+                    continue
+                values = value if isinstance(value, list) else [value]
+                self._client_filters[key] = tuple(values)
+        return self._client_filters
+
+    @property
+    def dedup_keys(self) -> RollingKeySet | None:
+        """Return the primary keys of the records emitted most recently.
+
+        Returns:
+            The key set used to drop duplicate records, or ``None`` when
+            deduplication is disabled or the stream has no primary keys.
+        """
+        window = int(self.config.get("dedup_window", 100000))
+        if not window or not self.primary_keys:
+            return None
+        if getattr(self, "_dedup_keys", None) is None:
+            self._dedup_keys = RollingKeySet(window)
+        return self._dedup_keys
+
+    @property
+    def response_archive(self) -> ResponseArchive | None:
+        """Return the response archive used in record and replay modes.
+
+        Returns:
+            The stream's archive, or ``None`` when ``replay_mode`` is not set.
+        """
+        if not self.config.get("replay_mode"):
+            return None
+        if getattr(self, "_response_archive", None) is None:
+            self._response_archive = ResponseArchive(
+                self.config.get("replay_archive_path", ".grafana_replay"),
+                self.name,
+            )
+        return self._response_archive
+
+    @property
+    def circuit_breaker(self) -> CircuitBreaker | None:
+        """Return the circuit breaker of the stream's endpoint.
+
+        Returns:
+            The shared breaker, or ``None`` when circuit breaking is disabled.
+        """
+        threshold = int(self.config.get("circuit_breaker_threshold", 5))
+        if not threshold:
+            return None
+        return get_circuit_breaker(
+            self.path,
+            threshold,
+            float(self.config.get("circuit_breaker_reset_timeout", 300)),
+        )
+
+    def _request(
+        self,
+        prepared_request: requests.PreparedRequest,
+        context: dict | None,
+    ) -> requests.Response:
+        """Send a request, or serve it from the archive in replay mode.
+
+        In record mode every successful response is also written to the archive.
+        Transient failures count towards the endpoint's circuit breaker, and
+        requests to an endpoint with an open circuit fail fast.
+
+        Args:
+            prepared_request: The request to send.
+            context: The stream context.
+
+        Returns:
+            The validated response.
+        """
+        archive = self.response_archive
+        if archive is not None and self.config["replay_mode"] == "replay":
+            start = time.monotonic()
+            response = archive.load(prepared_request)
+            self.validate_response(response)
+            self._sample_page(response, time.monotonic() - start)
+            return response
+
+        breaker = self.circuit_breaker
+        if breaker is not None:
+            breaker.before_request()
+        start = time.monotonic()
+        try:
+            if self.config.get("hedge_requests"):
+                response = self._send_hedged(prepared_request, context)
+            else:
+                response = super()._request(prepared_request, context)
+        except (
+            RetriableAPIError,
+            ConnectionResetError,
+            requests.exceptions.RequestException,
+        ):
+            if breaker is not None and breaker.record_failure():
+                self._log_metric(
+                    metrics.Point(
+                        "counter",
+                        metric=ResilienceMetric.CIRCUIT_BREAKER_TRIPS,
+                        value=1,
+                        tags={
+                            metrics.Tag.STREAM: self.name,
+                            metrics.Tag.ENDPOINT: self.path,
+                            metrics.Tag.STATUS: CircuitState.OPEN.value,
+                        },
+                    )
+                )
+            raise
+        if breaker is not None:
+            breaker.record_success()
+        latency = time.monotonic() - start
+        self.latencies.add(latency)
+        self._sample_page(response, latency)
+
+        if archive is not None:
+            archive.save(prepared_request, response)
+        return response
+
+    def _sample_page(self, response: requests.Response, seconds: float) -> None:
+        """Add a fetched or replayed page to the sample statistics, if sampling.
+
+        Args:
+            response: The page response.
+            seconds: Time the request took.
+        """
+        if self.sample_stats is None:
+            return
+        self.sample_stats.add_page(
+            response,
+            seconds,
+            decode_json(response).get("count"),
+            sum(1 for _ in self.parse_response(response)),
+        )
+
+    def _send_hedged(
+        self,
+        prepared_request: requests.PreparedRequest,
+        context: dict | None,
+    ) -> requests.Response:
+        """Send a request, duplicating it if it is slower than usual.
+
+        When the request has not completed within the endpoint's p95 latency, an
+        identical hedge request is sent and whichever succeeds first is used.
+
+        Args:
+            prepared_request: The request to send.
+            context: The stream context.
+
+        Returns:
+            The validated response.
+        """
+        send = super()._request
+        delay = self.latencies.percentile(0.95)
+        if delay is None:
+            return send(prepared_request, context)
+
+        if self._hedge_executor is None:
+            # Room for the requests of two pages, as a losing request keeps
+            # its worker until it completes.
+            self._hedge_executor = ThreadPoolExecutor(
+                max_workers=4,
+                thread_name_prefix=f"{self.name}-hedge",
+            )
+        primary = self._hedge_executor.submit(send, prepared_request, context)
+        try:
+            return primary.result(timeout=delay)
+        except TimeoutError:
+            pass
+
+        self.hedges_sent += 1
+        hedge = self._hedge_executor.submit(send, prepared_request.copy(), context)
+        for future in as_completed([primary, hedge]):
+            if future.exception() is None:
+                if future is hedge:
+                    self.hedges_won += 1
+                return future.result()
+        return primary.result()
+
+    def _log_hedge_metrics(self) -> None:
+        """Log how many hedge requests the stream sent and how many won."""
+        if not self.hedges_sent:
+            return
+        tags = {metrics.Tag.STREAM: self.name, metrics.Tag.ENDPOINT: self.path}
+        for metric, value in (
+            (ResilienceMetric.HEDGE_REQUEST_COUNT, self.hedges_sent),
+            (ResilienceMetric.HEDGE_WIN_COUNT, self.hedges_won),
+        ):
+            self._log_metric(metrics.Point("counter", metric, value, tags))
+        self.hedges_sent = self.hedges_won = 0
+
+    @property
+    def prefetch_pages(self) -> int:
+        """Return how many fetched pages may wait ahead of the one being parsed.
+
+        Returns:
+            The depth of the page queue, or 0 to fetch pages sequentially.
+        """
+        return max(int(self.config.get("prefetch_pages", 0)), 0)
+
+    def request_records(self, context: dict | None) -> Iterable[dict]:
+        """Request records from the REST endpoint, following pagination.
+
+        With ``dedup_recheck_head`` enabled the first page is requested again
+        once pagination finishes, to pick up records created during the crawl.
+        Records already emitted are dropped by the dedup stage in
+        ``post_process``.
+
+        Args:
+            context: The stream context.
+
+        Yields:
+            An item for every record in the response.
+        """
+        yield from self._request_pages(context)
+
+        if self.config.get("dedup_recheck_head") and self.dedup_keys is not None:
+            prepared_request = self.prepare_request(context, next_page_token=None)
+            decorated_request = self.request_decorator(self._request)
+            resp = decorated_request(prepared_request, context)
+            self.update_sync_costs(prepared_request, resp, context)
+            yield from self.parse_response(resp)
+
+    def _request_pages(self, context: dict | None) -> Iterable[dict]:
+        """Request records page by page, following the ``next`` links.
+
+        With ``prefetch_pages`` above 0 a background fetcher follows the
+        ``next`` links as soon as they are known and hands pages over through a
+        queue, so network I/O overlaps with parsing and emitting. The fetcher
+        takes a slot before each request and the consumer frees it when it
+        takes the page, so at most ``prefetch_pages`` pages are fetched ahead
+        of the page being parsed. The fetcher decodes each page to find the
+        next link, so a buffered page holds both its body and the decoded
+        document. Otherwise the SDK's sequential loop is used.
+
+        Args:
+            context: The stream context.
+
+        Yields:
+            An item for every record in the response.
+        """
+        if not self.prefetch_pages:
+            yield from super().request_records(context)
+            return
+
+        pages: queue.Queue = queue.Queue()
+        slots = threading.Semaphore(self.prefetch_pages)
+        stop = threading.Event()
+        fetcher = threading.Thread(
+            target=self._fetch_pages,
+            args=(context, pages, slots, stop),
+            name=f"{self.name}-fetcher",
+            daemon=True,
+        )
+        page_count = 0
+
+        with metrics.http_request_counter(self.name, self.path) as request_counter:
+            request_counter.context = context
+            fetcher.start()
+            try:
+                while True:
+                    item = pages.get()
+                    if item is None:
+                        break
+                    if isinstance(item, Exception):
+                        raise item
+
+                    prepared_request, resp = item
+                    slots.release()
+                    request_counter.increment()
+                    self.update_sync_costs(prepared_request, resp, context)
+
+                    records = iter(self.parse_response(resp))
+                    try:
+                        first_record = next(records)
+                    except StopIteration:
+                        self.logger.info(
+                            "Pagination stopped after %d pages because no records "
+                            "were found in the last response",
+                            page_count,
+                        )
+                        break
+                    yield first_record
+                    yield from records
+                    page_count += 1
+            finally:
+                stop.set()
+                fetcher.join()
+
+    def _fetch_pages(
+        self,
+        context: dict | None,
+        pages: queue.Queue,
+        slots: threading.Semaphore,
+        stop: threading.Event,
+    ) -> None:
+        """Request pages in order and put them on the page queue.
+
+        Runs on the fetcher thread. The queue is terminated with ``None`` once
+        pagination finishes, or with the exception that stopped it.
+
+        Args:
+            context: The stream context.
+            pages: Queue receiving ``(prepared_request, response)`` items.
+            slots: Semaphore bounding the pages fetched ahead of the consumer.
+            stop: Event set by the consumer when it no longer needs pages.
+        """
+        paginator = self.get_new_paginator()
+        decorated_request = self.request_decorator(self._request)
+        try:
+            while not paginator.finished and self._take_slot(slots, stop):
+                prepared_request = self.prepare_request(
+                    context,
+                    next_page_token=paginator.current_value,
+                )
+                resp = decorated_request(prepared_request, context)
+                pages.put((prepared_request, resp))
+                paginator.advance(resp)
+        except Exception as exc:  # noqa: BLE001
+            pages.put(exc)
+        else:
+            pages.put(None)
+
+    @staticmethod
+    def _take_slot(slots: threading.Semaphore, stop: threading.Event) -> bool:
+        """Wait for a free prefetch slot, unless stopped.
+
+        Args:
+            slots: Semaphore bounding the pages fetched ahead of the consumer.
+            stop: Event set by the consumer when it no longer needs pages.
+
+        Returns:
+            ``True`` once a slot was taken, ``False`` if stopped first.
+        """
+        while not stop.is_set():
+            if slots.acquire(timeout=0.1):
+                return True
+        return False
+
     @property
     def authenticator(self) -> APIKeyAuthenticator:
         """Return a new authenticator object.
@@ -87,7 +612,7 @@ class GrafanaRestStream(RESTStream):
         Returns:
             A pagination helper instance.
         """
-        return GrafanaPaginator()
+        return GrafanaPaginator(max_pages=self._tap.sample_pages or None)
 
     def get_url_params(
         self,
@@ -107,6 +632,13 @@ class GrafanaRestStream(RESTStream):
 
         if next_page_token:
             params.update(parse_qsl(next_page_token.query))
+        else:
+            # The "next" links returned by the API already carry the filters.
+            params.update(
+                (key, value)
+                for key, value in self.stream_filters.items()
+                if key in self.filter_params
+            )
 
         if self.replication_key:
             params["sort"] = "asc"
@@ -141,8 +673,7 @@ class GrafanaRestStream(RESTStream):
         Yields:
             Each record from the source.
         """
-        # TODO: Parse response body and return a set of records.
-        yield from extract_jsonpath(self.records_jsonpath, input=response.json())
+        yield from extract_jsonpath(self.records_jsonpath, input=decode_json(response))
 
     def post_process(
         self,
@@ -151,6 +682,13 @@ class GrafanaRestStream(RESTStream):
     ) -> dict | None:
         """As needed, append or transform raw data to match expected structure.
 
+        Records not matching the client-side `stream_filters` are skipped, and
+        so are records whose primary key was emitted within the last
+        ``dedup_window`` records. New records shift the OnCall list pages during
+        a crawl, so the same record can show up on two consecutive pages.
+        Records missing part of their primary key are never dropped as
+        duplicates.
+
         Args:
             row: An individual record from the stream.
             context: The stream context.
@@ -158,5 +696,23 @@ class GrafanaRestStream(RESTStream):
         Returns:
             The updated record dictionary, or ``None`` to skip the record.
         """
-        # TODO: Delete this method if not needed.
+        for key, values in self.client_filters.items():
+            if row.get(key) not in values:
+                return None
+        dedup_keys = self.dedup_keys
+        if dedup_keys is not None:
+            key = tuple(row.get(key) for key in self.primary_keys)
+            if None in key:
+                # Records without a complete key cannot be told apart.
+                if not getattr(self, "_warned_missing_key", False):
+                    self.logger.warning(
+                        "Not deduplicating records of stream '%s' without a "
+                        "complete primary key",
+                        self.name,
+                    )
+                    self._warned_missing_key = True
+            elif not dedup_keys.add(key):
+                return None
+        if self.sample_stats is not None:
+            self.sample_stats.add_record(row)
         return row
@@ -36,6 +36,16 @@ class OnCallAlertGroupsStream(GrafanaRestStream):
     path = f"/api/{API_VERSION}/alert_groups"
     primary_keys = ["id"]
     replication_key = None
+    filter_params = (
+        "id",
+        "route_id",
+        "integration_id",
+        "state",
+        "team_id",
+        "started_at",
+        "labels",
+        "name",
+    )
 
     perma_links_schema = th.ObjectType(
         th.Property(
@@ -36,6 +36,7 @@ class OnCallAlertsStream(GrafanaRestStream):
     path = f"/api/{API_VERSION}/alerts"
     primary_keys = ["id"]
     replication_key = None
+    filter_params = ("alert_group_id", "search")
 
     alert_org_schema = th.ObjectType(
         th.Property(
@@ -0,0 +1,125 @@
+"""
+    A Meltano stream class for Grafana OnCall endpoints defined in the tap config.
+
+    This class lets new OnCall list endpoints be extracted without a code change.
+    Each entry of the `custom_streams` setting gives the stream name, the API
+    path and the key properties. The record schema is taken from the entry's
+    `schema`, from a schema file cached in `tap_grafana/schemas/`, or else
+    inferred by sampling the first pages of the endpoint and then cached. An
+    empty endpoint yields an empty schema, which is not cached.
+
+    References:
+        Grafana OnCall API Documentation: https://grafana.com/docs/oncall/latest/oncall-api-reference/
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+import typing as t
+from pathlib import Path
+
+from tap_grafana import schemas
+from tap_grafana.client import GrafanaRestStream
+from tap_grafana.schema_inference import SchemaBuilder
+
+if sys.version_info >= (3, 9):
+    import importlib.resources as importlib_resources
+else:
+    import importlib_resources
+
+if t.TYPE_CHECKING:
+    from singer_sdk import Tap
+
+
+class OnCallCustomStream(GrafanaRestStream):
+    """
+    Meltano stream class for an OnCall endpoint defined in the tap config.
+    """
+
+    def __init__(self, tap: Tap, definition: dict) -> None:
+        """Create a stream from a `custom_streams` entry.
+
+        Args:
+            tap: The tap the stream belongs to.
+            definition: The stream's `custom_streams` config entry.
+        """
+        schema = definition.get("schema") or self.cached_schema(definition["name"])
+        super().__init__(
+            tap,
+            name=definition["name"],
+            schema=schema or {"type": "object", "properties": {}},
+            path=definition["path"],
+        )
+        self.primary_keys = definition.get("primary_keys", ["id"])
+        self.replication_key = definition.get("replication_key")
+
+        if not schema:
+            self._schema = self.infer_schema(
+                int(self.config.get("schema_sample_pages", 1))
+            )
+            if self._schema["properties"]:
+                self.cache_schema()
+            else:
+                self.logger.warning(
+                    "No records sampled for '%s', so its schema is empty and is "
+                    "not cached. Add a `schema` to its custom_streams entry, or "
+                    "sync it again once the endpoint returns records",
+                    self.name,
+                )
+
+    @staticmethod
+    def cached_schema(name: str) -> dict | None:
+        """Return the schema cached for a stream, if any.
+
+        Args:
+            name: The stream name.
+
+        Returns:
+            The cached JSON schema, or ``None``.
+        """
+        schema_file = importlib_resources.files(schemas) / f"{name}.json"
+        if not schema_file.is_file():
+            return None
+        return json.loads(schema_file.read_text())
+
+    def cache_schema(self) -> None:
+        """Write the stream's schema to `tap_grafana/schemas/`."""
+        schema_dir = Path(str(importlib_resources.files(schemas)))
+        schema_file = schema_dir / f"{self.name}.json"
+        try:
+            schema_file.write_text(json.dumps(self.schema, indent=2) + "\n")
+        except OSError as exc:
+            self.logger.warning("Could not cache schema for '%s': %s", self.name, exc)
+
+    def infer_schema(self, max_pages: int) -> dict:
+        """Infer the record schema from the first pages of the endpoint.
+
+        Args:
+            max_pages: Maximum number of pages to sample.
+
+        Returns:
+            The inferred JSON schema.
+        """
+        builder = SchemaBuilder()
+        paginator = self.get_new_paginator()
+        decorated_request = self.request_decorator(self._request)
+        pages = 0
+        while not paginator.finished and pages < max_pages:
+            prepared_request = self.prepare_request(
+                None,
+                next_page_token=paginator.current_value,
+            )
+            resp = decorated_request(prepared_request, None)
+            for record in self.parse_response(resp):
+                builder.add(record)
+            paginator.advance(resp)
+            pages += 1
+
+        self.logger.info(
+            "Inferred schema for '%s' from %d records on %d pages",
+            self.name,
+            builder.record_count,
+            pages,
+        )
+        return builder.to_schema()
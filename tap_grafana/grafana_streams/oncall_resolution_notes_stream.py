@@ -36,6 +36,7 @@ class OnCallResolutionNotesStream(GrafanaRestStream):
     path = f"/api/{API_VERSION}/resolution_notes"
     primary_keys = ["id"]
     replication_key = None
+    filter_params = ("alert_group_id",)
 
     oncall_resolution_note_schema = th.PropertiesList(
         th.Property(
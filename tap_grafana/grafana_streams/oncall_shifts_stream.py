@@ -36,6 +36,7 @@ class OnCallShiftsStream(GrafanaRestStream):
     path = f"/api/{API_VERSION}/on_call_shifts"
     primary_keys = ["id"]
     replication_key = None
+    filter_params = ("name", "schedule_id")
 
     oncall_shifts_schema = th.ObjectType(
         th.Property(
@@ -0,0 +1,154 @@
+"""
+    Local archive of raw Grafana API responses for record and replay runs.
+
+    In record mode every successful page is written to the archive, and in replay
+    mode those pages are served back instead of calling the API. This allows
+    offline re-extraction with a new schema, deterministic benchmarks and
+    regression tests of the parsing path.
+
+    Each stream gets its own directory in the archive. Page bodies are stored
+    gzip-compressed, one file per request, and an ``index.jsonl`` file maps the
+    request path and query to the stored status, response headers and body file.
+    A request sent more than once in a run, such as the first page requested
+    again by ``dedup_recheck_head``, is archived once per occurrence and the
+    occurrences are replayed in order.
+    The host is left out of the key, so an archive can be replayed against any
+    ``api_base_url``. Request headers are never stored, so API keys do not end up
+    in the archive.
+"""
+
+from __future__ import annotations
+
+import datetime
+import gzip
+import hashlib
+import json
+import threading
+from collections import Counter
+from pathlib import Path
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from singer_sdk.exceptions import FatalAPIError
+
+INDEX_FILE = "index.jsonl"
+
+
+class ResponseArchive:
+    """Archive of raw API responses for a single stream."""
+
+    def __init__(self, root: str | Path, stream_name: str) -> None:
+        """Create an archive rooted at ``root``.
+
+        Args:
+            root: The archive directory shared by all streams.
+            stream_name: Name of the stream whose responses are archived.
+        """
+        self.path = Path(root) / stream_name
+        self._index: dict[str, dict] | None = None
+        self._lock = threading.Lock()
+        self._saved: Counter[str] = Counter()
+        self._loaded: Counter[str] = Counter()
+
+    @staticmethod
+    def _key(path_url: str, occurrence: int) -> str:
+        return f"{path_url}#{occurrence}" if occurrence else path_url
+
+    @staticmethod
+    def _page_file(key: str) -> str:
+        return hashlib.sha256(key.encode()).hexdigest() + ".json.gz"
+
+    @staticmethod
+    def _next_occurrence(counter: Counter[str], path_url: str) -> int:
+        occurrence = counter[path_url]
+        counter[path_url] += 1
+        return occurrence
+
+    def save(
+        self,
+        request: requests.PreparedRequest,
+        response: requests.Response,
+    ) -> None:
+        """Write a response to the archive.
+
+        Args:
+            request: The request that produced the response.
+            response: The response to archive.
+        """
+        with self._lock:
+            occurrence = self._next_occurrence(self._saved, request.path_url)
+        page_file = self._page_file(self._key(request.path_url, occurrence))
+        entry = {
+            "request": request.path_url,
+            "occurrence": occurrence,
+            "status_code": response.status_code,
+            "reason": response.reason,
+            "headers": dict(response.headers),
+            "file": page_file,
+        }
+        with self._lock:
+            self.path.mkdir(parents=True, exist_ok=True)
+            with gzip.open(self.path / page_file, "wb") as body:
+                body.write(response.content)
+            with (self.path / INDEX_FILE).open("a", encoding="utf-8") as index:
+                index.write(json.dumps(entry) + "\n")
+
+    def load(self, request: requests.PreparedRequest) -> requests.Response:
+        """Return the archived response for the next occurrence of a request.
+
+        Args:
+            request: The request to look up.
+
+        Returns:
+            A response rebuilt from the archive.
+
+        Raises:
+            FatalAPIError: If the archive holds no response for the request.
+        """
+        index = self.index
+        with self._lock:
+            occurrence = self._next_occurrence(self._loaded, request.path_url)
+        entry = index.get(self._key(request.path_url, occurrence))
+        if entry is None:
+            msg = (
+                f"No recorded response in {self.path} for occurrence "
+                f"{occurrence + 1} of {request.path_url}"
+            )
+            raise FatalAPIError(msg)
+
+        response = requests.Response()
+        response.url = request.url
+        response.request = request
+        response.status_code = entry["status_code"]
+        response.reason = entry["reason"]
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        response.headers.pop("Content-Encoding", None)
+        response.elapsed = datetime.timedelta(0)
+        with gzip.open(self.path / entry["file"], "rb") as body:
+            response._content = body.read()  # noqa: SLF001
+        return response
+
+    @property
+    def index(self) -> dict[str, dict]:
+        """Return the archive index, keyed by request path, query and occurrence.
+
+        Later entries win, so re-recording into an existing archive replaces
+        the earlier pages.
+
+        Returns:
+            A mapping of request key to archive entry.
+        """
+        with self._lock:
+            if self._index is None:
+                self._index = {}
+                index_path = self.path / INDEX_FILE
+                if index_path.exists():
+                    with index_path.open(encoding="utf-8") as index:
+                        for line in index:
+                            entry = json.loads(line)
+                            key = self._key(
+                                entry["request"],
+                                entry.get("occurrence", 0),
+                            )
+                            self._index[key] = entry
+            return self._index
@@ -0,0 +1,205 @@
+"""
+    Circuit breakers and latency tracking for Grafana API endpoints.
+
+    A circuit breaker counts consecutive transient failures of one endpoint. Once
+    ``failure_threshold`` is reached the circuit opens and requests to the
+    endpoint fail fast with `CircuitOpenError` instead of waiting through more
+    retries, so a dead endpoint cannot stall the rest of the run. After
+    ``reset_timeout`` seconds the circuit is half-open: one trial request is let
+    through, and its outcome closes or re-opens the circuit. Other requests keep
+    failing fast while the trial is in flight, unless it has been pending for
+    another ``reset_timeout``.
+
+    Breakers are shared by every stream of the tap process requesting the same
+    endpoint.
+"""
+
+from __future__ import annotations
+
+import collections
+import enum
+import threading
+import time
+
+from singer_sdk.exceptions import FatalAPIError
+
+# Latency percentiles are only trusted once this many samples were collected.
+MIN_LATENCY_SAMPLES = 20
+
+
+class CircuitOpenError(FatalAPIError):
+    """Raised when a request is refused because the endpoint's circuit is open."""
+
+
+class ResilienceMetric(str, enum.Enum):
+    """Metrics logged by circuit breakers and hedged requests."""
+
+    CIRCUIT_BREAKER_TRIPS = "circuit_breaker_trips"
+    HEDGE_REQUEST_COUNT = "hedge_request_count"
+    HEDGE_WIN_COUNT = "hedge_win_count"
+
+
+class CircuitState(str, enum.Enum):
+    """States of a circuit breaker."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Circuit breaker for a single API endpoint."""
+
+    def __init__(
+        self,
+        endpoint: str,
+        failure_threshold: int,
+        reset_timeout: float,
+    ) -> None:
+        """Create a closed circuit breaker.
+
+        Args:
+            endpoint: The endpoint path guarded by the breaker.
+            failure_threshold: Consecutive failures that open the circuit.
+            reset_timeout: Seconds before an open circuit lets a trial through.
+        """
+        self.endpoint = endpoint
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: float | None = None
+        self.trial_started_at: float | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> CircuitState:
+        """Return the current state of the circuit.
+
+        Returns:
+            The circuit state.
+        """
+        if self.opened_at is None:
+            return CircuitState.CLOSED
+        if time.monotonic() - self.opened_at < self.reset_timeout:
+            return CircuitState.OPEN
+        return CircuitState.HALF_OPEN
+
+    def before_request(self) -> None:
+        """Check that a request to the endpoint may be sent.
+
+        While the circuit is half-open only the first request, the trial, is
+        let through.
+
+        Raises:
+            CircuitOpenError: If the circuit is open, or half-open with a trial
+                request in flight.
+        """
+        with self._lock:
+            state = self.state
+            if state is CircuitState.HALF_OPEN:
+                now = time.monotonic()
+                if (
+                    self.trial_started_at is None
+                    or now - self.trial_started_at >= self.reset_timeout
+                ):
+                    self.trial_started_at = now
+                    return
+            elif state is CircuitState.CLOSED:
+                return
+        msg = (
+            f"Circuit breaker for {self.endpoint} is {state.value} after "
+            f"{self.failures} consecutive failures"
+        )
+        raise CircuitOpenError(msg)
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful request."""
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_started_at = None
+
+    def record_failure(self) -> bool:
+        """Count a failed request, opening the circuit at the threshold.
+
+        Returns:
+            ``True`` if this failure tripped the circuit open.
+        """
+        with self._lock:
+            self.failures += 1
+            if self.failures < self.failure_threshold:
+                return False
+            tripped = self.opened_at is None or self.state is CircuitState.HALF_OPEN
+            self.opened_at = time.monotonic()
+            self.trial_started_at = None
+            return tripped
+
+    def allow_trial(self) -> None:
+        """Move an open circuit to half-open without waiting for the timeout."""
+        with self._lock:
+            if self.opened_at is not None:
+                self.opened_at = time.monotonic() - self.reset_timeout
+                self.trial_started_at = None
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(
+    endpoint: str,
+    failure_threshold: int,
+    reset_timeout: float,
+) -> CircuitBreaker:
+    """Return the circuit breaker shared by all requests to an endpoint.
+
+    Args:
+        endpoint: The endpoint path.
+        failure_threshold: Consecutive failures that open the circuit.
+        reset_timeout: Seconds before an open circuit lets a trial through.
+
+    Returns:
+        The endpoint's circuit breaker.
+    """
+    with _breakers_lock:
+        if endpoint not in _breakers:
+            _breakers[endpoint] = CircuitBreaker(
+                endpoint,
+                failure_threshold,
+                reset_timeout,
+            )
+        return _breakers[endpoint]
+
+
+class LatencyTracker:
+    """Rolling window of request latencies of one endpoint."""
+
+    def __init__(self, window: int = 200) -> None:
+        """Create an empty tracker.
+
+        Args:
+            window: Number of most recent latencies kept.
+        """
+        self._latencies: collections.deque[float] = collections.deque(maxlen=window)
+
+    def add(self, seconds: float) -> None:
+        """Record the latency of a successful request.
+
+        Args:
+            seconds: The request latency in seconds.
+        """
+        self._latencies.append(seconds)
+
+    def percentile(self, fraction: float) -> float | None:
+        """Return a latency percentile of the recorded requests.
+
+        Args:
+            fraction: The percentile as a fraction, e.g. 0.95.
+
+        Returns:
+            The latency in seconds, or ``None`` until enough samples exist.
+        """
+        if len(self._latencies) < MIN_LATENCY_SAMPLES:
+            return None
+        ordered = sorted(self._latencies)
+        return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
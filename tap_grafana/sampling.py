@@ -0,0 +1,115 @@
+"""
+    Throughput estimation for sample runs.
+
+    In sample mode each stream only fetches its first pages. `SampleStats`
+    collects what those pages cost, validates their records against the stream
+    schema and extrapolates the totals of a full sync from the `count` returned
+    by the OnCall list endpoints. The API counts records before client-side
+    filters and deduplication, so the estimates are based on the records each
+    page returned, not on the records the stream emitted.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+import typing as t
+
+from jsonschema import Draft7Validator
+
+if t.TYPE_CHECKING:
+    import logging
+
+    import requests
+
+
+class SampleStats:
+    """Measurements and estimates for the sampled pages of one stream."""
+
+    def __init__(self, schema: dict) -> None:
+        """Create empty statistics for a stream.
+
+        Args:
+            schema: The stream's JSON schema, used to validate sampled records.
+        """
+        self.validator = Draft7Validator(schema)
+        self.pages = 0
+        self.page_records = 0
+        self.records = 0
+        self.invalid_records = 0
+        self.bytes = 0
+        self.request_seconds = 0.0
+        self.total_count: int | None = None
+        self.started_at: float | None = None
+
+    def add_page(
+        self,
+        response: requests.Response,
+        seconds: float,
+        total_count: int | None,
+        page_records: int,
+    ) -> None:
+        """Record a fetched page.
+
+        Args:
+            response: The page response.
+            seconds: Time the request took.
+            total_count: Total number of records reported by the endpoint.
+            page_records: Number of records on the page, before filtering.
+        """
+        if self.started_at is None:
+            self.started_at = time.monotonic() - seconds
+            self.total_count = total_count
+        self.pages += 1
+        self.page_records += page_records
+        self.bytes += len(response.content)
+        self.request_seconds += seconds
+
+    def add_record(self, record: dict) -> None:
+        """Validate and count a record the stream emitted.
+
+        Args:
+            record: The record after post-processing.
+        """
+        self.records += 1
+        if not self.validator.is_valid(record):
+            self.invalid_records += 1
+
+    def report(self) -> dict[str, t.Any]:
+        """Return the sample measurements and the estimates for a full sync.
+
+        Returns:
+            A dictionary of measured and estimated values.
+        """
+        elapsed = time.monotonic() - self.started_at if self.started_at else 0.0
+        report: dict[str, t.Any] = {
+            "sampled_pages": self.pages,
+            "sampled_records": self.page_records,
+            "emitted_records": self.records,
+            "invalid_records": self.invalid_records,
+            "sampled_bytes": self.bytes,
+            "mean_request_seconds": round(self.request_seconds / self.pages, 3)
+            if self.pages
+            else None,
+        }
+        if not self.pages or not self.page_records:
+            return report
+
+        total_records = self.total_count or self.page_records
+        total_pages = math.ceil(total_records / (self.page_records / self.pages))
+        report.update(
+            estimated_records=total_records,
+            estimated_pages=total_pages,
+            estimated_bytes=round(self.bytes / self.pages * total_pages),
+            projected_seconds=round(elapsed / self.pages * total_pages, 1),
+        )
+        return report
+
+    def log(self, logger: logging.Logger, stream_name: str) -> None:
+        """Log the sample report of a stream.
+
+        Args:
+            logger: The logger to write to.
+            stream_name: Name of the sampled stream.
+        """
+        logger.info("Sample report for '%s': %s", stream_name, self.report())
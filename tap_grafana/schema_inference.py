@@ -0,0 +1,100 @@
+"""
+    Incremental JSON schema inference from sample records.
+
+    `SchemaBuilder` takes records one at a time and keeps, for every field, the
+    set of JSON types seen, nested properties for objects and a merged item node
+    for arrays, so sampling a page costs a single pass over its records. Every
+    inferred property is nullable, since a field missing from the sample pages
+    may still be absent or null in later records.
+"""
+
+from __future__ import annotations
+
+import re
+import typing as t
+
+DATETIME_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}")
+
+_JSON_TYPES: dict[type, str] = {
+    bool: "boolean",
+    int: "integer",
+    float: "number",
+    str: "string",
+    dict: "object",
+    list: "array",
+}
+
+
+class _Node:
+    """Types seen for one location in the sampled records."""
+
+    __slots__ = ("types", "properties", "items", "all_datetimes")
+
+    def __init__(self) -> None:
+        self.types: set[str] = set()
+        self.properties: dict[str, _Node] = {}
+        self.items: _Node | None = None
+        self.all_datetimes = True
+
+    def add(self, value: t.Any) -> None:  # noqa: ANN401
+        if value is None:
+            return
+        json_type = _JSON_TYPES.get(type(value), "string")
+        self.types.add(json_type)
+        if json_type == "object":
+            for key, item in value.items():
+                self.properties.setdefault(key, _Node()).add(item)
+        elif json_type == "array":
+            if self.items is None:
+                self.items = _Node()
+            for item in value:
+                self.items.add(item)
+        elif json_type == "string" and self.all_datetimes:
+            self.all_datetimes = bool(DATETIME_PATTERN.match(value))
+
+    def to_schema(self) -> dict:
+        if not self.types:
+            return {}
+        types = set(self.types)
+        if "number" in types:
+            types.discard("integer")
+        schema: dict[str, t.Any] = {"type": [*sorted(types), "null"]}
+        if "object" in types:
+            schema["properties"] = {
+                key: node.to_schema() for key, node in self.properties.items()
+            }
+        if "array" in types:
+            schema["items"] = self.items.to_schema() if self.items else {}
+        if "string" in types and self.all_datetimes:
+            schema["format"] = "date-time"
+        return schema
+
+
+class SchemaBuilder:
+    """Infers a JSON schema for a stream from the records added to it."""
+
+    def __init__(self) -> None:
+        self._root = _Node()
+        self.record_count = 0
+
+    def add(self, record: dict) -> None:
+        """Merge the types of a sample record into the schema.
+
+        Args:
+            record: A record of the stream.
+        """
+        self._root.add(record)
+        self.record_count += 1
+
+    def to_schema(self) -> dict:
+        """Return the schema inferred from the records added so far.
+
+        Returns:
+            A JSON schema object for the stream's records.
+        """
+        return {
+            "type": "object",
+            "properties": {
+                key: node.to_schema() for key, node in self._root.properties.items()
+            },
+        }
@@ -40,3 +40,4 @@ from tap_grafana.grafana_streams.oncall_shifts_stream import OnCallShiftsStream
 from tap_grafana.grafana_streams.oncall_resolution_notes_stream import (
     OnCallResolutionNotesStream,
 )
+from tap_grafana.grafana_streams.oncall_custom_stream import OnCallCustomStream
@@ -8,17 +8,28 @@ the necessary API URL and headers, and uses it to fetch and manage data from the
 
 from __future__ import annotations
 
+import typing as t
+
+import click
 from singer_sdk import Tap
+from singer_sdk.exceptions import ConfigValidationError
 from singer_sdk import typing as th  # JSON schema typing helpers
 
 from . import streams, client
 
+# A `stream_filters` value: a scalar, or an array of accepted scalars.
+FILTER_SCALAR = th.CustomType({"type": ["string", "number", "boolean", "null"]})
+
 
 class TapGrafana(Tap):
     """Meltano tap extractor calss for the source Grafana."""
 
     name = "tap-grafana"
 
+    # Set from the --sample and --dry-run command line options.
+    cli_sample_pages: int | None = None
+    cli_dry_run = False
+
     # TODO: Update this section with the actual config values you expect:
     config_jsonschema = th.PropertiesList(
         th.Property(
@@ -39,6 +50,169 @@ class TapGrafana(Tap):
             required=True,
             description="Base url for the Grafana OnCall module API service",
         ),
+        th.Property(
+            "custom_streams",
+            th.ArrayType(
+                th.ObjectType(
+                    th.Property(
+                        "name",
+                        th.StringType,
+                        required=True,
+                        description="Name of the stream",
+                    ),
+                    th.Property(
+                        "path",
+                        th.StringType,
+                        required=True,
+                        description="API path of the endpoint, e.g. /api/v1/teams",
+                    ),
+                    th.Property(
+                        "primary_keys",
+                        th.ArrayType(th.StringType),
+                        description="Primary key properties, defaults to ['id']",
+                    ),
+                    th.Property(
+                        "replication_key",
+                        th.StringType,
+                        description="Replication key property of the stream",
+                    ),
+                    th.Property(
+                        "schema",
+                        th.ObjectType(),
+                        description=(
+                            "JSON schema of the records. Inferred from sample "
+                            "pages and cached when omitted"
+                        ),
+                    ),
+                )
+            ),
+            description="Additional OnCall list endpoints to extract as streams",
+        ),
+        th.Property(
+            "schema_sample_pages",
+            th.IntegerType,
+            default=1,
+            description=(
+                "Number of pages sampled to infer the schema of a custom stream "
+                "without a cached schema"
+            ),
+        ),
+        th.Property(
+            "stream_filters",
+            th.ObjectType(
+                additional_properties=th.ObjectType(
+                    additional_properties=th.OneOf(
+                        FILTER_SCALAR,
+                        th.ArrayType(FILTER_SCALAR),
+                    ),
+                ),
+            ),
+            description=(
+                "Per-stream record filters, keyed by stream name, e.g. "
+                '{"oncall_alert_groups": {"state": "resolved"}}. Filters the '
+                "OnCall API supports are sent as query parameters, others are "
+                "applied to the records client-side. Filter values are scalars "
+                "or arrays of accepted scalars"
+            ),
+        ),
+        th.Property(
+            "dedup_window",
+            th.IntegerType,
+            default=100000,
+            description=(
+                "Number of most recent primary keys remembered per stream to drop "
+                "records repeated across shifted pages. 0 disables deduplication"
+            ),
+        ),
+        th.Property(
+            "dedup_recheck_head",
+            th.BooleanType,
+            default=False,
+            description=(
+                "Request the first page again after pagination, to pick up "
+                "records created during the sync"
+            ),
+        ),
+        th.Property(
+            "state_message_frequency",
+            th.IntegerType(minimum=1),
+            default=10000,
+            description="Number of records between STATE messages, at least 1",
+        ),
+        th.Property(
+            "state_message_interval",
+            th.NumberType,
+            default=0,
+            description=(
+                "Minimum number of seconds between STATE messages of a stream. "
+                "The final STATE message of each stream is always written"
+            ),
+        ),
+        th.Property(
+            "circuit_breaker_threshold",
+            th.IntegerType,
+            default=5,
+            description=(
+                "Consecutive transient failures after which requests to an "
+                "endpoint fail fast and its stream is deferred to the end of the "
+                "run. 0 disables circuit breaking"
+            ),
+        ),
+        th.Property(
+            "circuit_breaker_reset_timeout",
+            th.NumberType,
+            default=300,
+            description="Seconds before an open circuit lets a trial request through",
+        ),
+        th.Property(
+            "hedge_requests",
+            th.BooleanType,
+            default=False,
+            description=(
+                "Send a duplicate request when a page takes longer than the "
+                "endpoint's p95 latency, and use whichever response comes first"
+            ),
+        ),
+        th.Property(
+            "prefetch_pages",
+            th.IntegerType,
+            default=0,
+            description=(
+                "Number of pages a background thread fetches ahead of the page "
+                "being processed. 0 fetches pages sequentially"
+            ),
+        ),
+        th.Property(
+            "replay_mode",
+            th.StringType,
+            allowed_values=["record", "replay"],
+            description=(
+                "'record' writes every API response to the replay archive, "
+                "'replay' serves responses from the archive instead of the API"
+            ),
+        ),
+        th.Property(
+            "replay_archive_path",
+            th.StringType,
+            default=".grafana_replay",
+            description="Directory of the replay archive",
+        ),
+        th.Property(
+            "sample_pages",
+            th.IntegerType,
+            default=0,
+            description=(
+                "Fetch only the first N pages of each stream, validate their "
+                "records and log estimated totals and sync time. 0 disables "
+                "sampling"
+            ),
+        ),
+        th.Property(
+            "dry_run",
+            th.BooleanType,
+            default=False,
+            description="Sync without writing any Singer messages",
+        ),
     ).to_dict()
 
     def discover_streams(self) -> list[client.GrafanaRestStream]:
@@ -46,13 +220,109 @@ class TapGrafana(Tap):
 
         Returns:
             A list of discovered streams.
+
+        Raises:
+            ConfigValidationError: If a custom stream reuses a stream name.
         """
-        return [
+        discovered: list[client.GrafanaRestStream] = [
             streams.OnCallAlertsStream(self),
             streams.OnCallAlertGroupsStream(self),
             streams.OnCallShiftsStream(self),
             streams.OnCallResolutionNotesStream(self),
         ]
+        for definition in self.config.get("custom_streams", []):
+            if definition["name"] in {stream.name for stream in discovered}:
+                msg = f"Custom stream name '{definition['name']}' is already in use"
+                raise ConfigValidationError(msg, errors=[msg])
+            discovered.append(streams.OnCallCustomStream(self, definition))
+        return discovered
+
+    @property
+    def sample_pages(self) -> int:
+        """Return the number of pages each stream fetches in sample mode.
+
+        Returns:
+            The page limit, or 0 when not sampling.
+        """
+        return self.cli_sample_pages or self.config.get("sample_pages", 0)
+
+    @property
+    def dry_run(self) -> bool:
+        """Return whether Singer messages are suppressed.
+
+        Returns:
+            True in dry-run mode.
+        """
+        return self.cli_dry_run or self.config.get("dry_run", False)
+
+    def write_message(self, message: t.Any) -> None:  # noqa: ANN401
+        """Write a Singer message, unless in dry-run mode.
+
+        Args:
+            message: The message to write.
+        """
+        if not self.dry_run:
+            super().write_message(message)
+
+    @classmethod
+    def get_singer_command(cls) -> click.Command:
+        """Add the --sample and --dry-run options to the tap's command.
+
+        Returns:
+            A click.Command object.
+        """
+        command = super().get_singer_command()
+        command.params.extend(
+            [
+                click.Option(
+                    ["--sample", "sample_pages"],
+                    type=click.IntRange(min=1),
+                    help=(
+                        "Fetch only the first N pages of each stream, validate the "
+                        "records and report estimated totals and sync time."
+                    ),
+                ),
+                click.Option(
+                    ["--dry-run"],
+                    is_flag=True,
+                    help="Sync without writing any Singer messages.",
+                ),
+            ],
+        )
+        return command
+
+    @classmethod
+    def invoke(  # type: ignore[override]
+        cls,
+        *,
+        sample_pages: int | None = None,
+        dry_run: bool = False,
+        **kwargs: t.Any,
+    ) -> None:
+        """Invoke the tap's command line interface.
+
+        Args:
+            sample_pages: Value of the --sample option.
+            dry_run: Value of the --dry-run flag.
+            kwargs: The standard tap command line arguments.
+        """
+        cls.cli_sample_pages = sample_pages
+        cls.cli_dry_run = dry_run
+        super().invoke(**kwargs)
+
+    def sync_all(self) -> None:
+        """Sync all streams, retrying deferred streams at the end of the run."""
+        super().sync_all()
+
+        # Streams that failed behind an open circuit breaker get one more try,
+        # after every other stream has been synced.
+        for stream in self.streams.values():
+            if not stream.deferred:
+                continue
+            self.logger.info("Retrying deferred stream '%s'", stream.name)
+            stream.circuit_breaker.allow_trial()
+            stream.sync()
+            stream.finalize_state_progress_markers()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,379 @@
+"""Tests for the GrafanaRestStream request loop, using canned API pages."""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+
+import backoff
+import pytest
+import requests
+
+from singer_sdk.exceptions import ConfigValidationError
+from singer_sdk.streams import RESTStream
+
+from tap_grafana import resilience
+from tap_grafana.sampling import SampleStats
+from tap_grafana.tap import TapGrafana
+
+BASE_URL = "https://oncall.example.com"
+
+
+def make_page(ids: list[str], next_url: str | None) -> requests.Response:
+    """Build a canned OnCall list response."""
+    response = requests.Response()
+    response.status_code = 200
+    response._content = json.dumps(  # noqa: SLF001
+        {
+            "count": len(ids),
+            "next": next_url,
+            "results": [{"id": record_id} for record_id in ids],
+        }
+    ).encode()
+    return response
+
+
+def get_stream(config: dict | None = None, name: str = "oncall_alerts"):
+    """Return a tap stream configured against the fake base URL."""
+    tap = TapGrafana(
+        config={"api_key": "key", "api_base_url": BASE_URL, **(config or {})},
+        parse_env_config=False,
+    )
+    return tap.streams[name]
+
+
+def serve_pages(monkeypatch, stream, pages: dict[str, requests.Response]) -> list:
+    """Answer the stream's requests from ``pages``, keyed by query string."""
+    requested = []
+
+    def fake_request(prepared_request, context):  # noqa: ARG001
+        query = requests.utils.urlparse(prepared_request.url).query
+        requested.append(query)
+        response = pages[query]
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    monkeypatch.setattr(stream, "_request", fake_request)
+    return requested
+
+
+@pytest.mark.parametrize("prefetch_pages", [0, 1, 3])
+def test_pagination_follows_next_links(monkeypatch, prefetch_pages):
+    stream = get_stream({"prefetch_pages": prefetch_pages})
+    serve_pages(
+        monkeypatch,
+        stream,
+        {
+            "": make_page(["1", "2"], f"{BASE_URL}/api/v1/alerts?page=2"),
+            "page=2": make_page(["3"], f"{BASE_URL}/api/v1/alerts?page=3"),
+            "page=3": make_page(["4"], None),
+        },
+    )
+
+    ids = [record["id"] for record in stream.request_records(None)]
+
+    assert ids == ["1", "2", "3", "4"]
+
+
+def test_prefetch_propagates_fetch_errors(monkeypatch):
+    stream = get_stream({"prefetch_pages": 2})
+    serve_pages(
+        monkeypatch,
+        stream,
+        {
+            "": make_page(["1"], f"{BASE_URL}/api/v1/alerts?page=2"),
+            "page=2": RuntimeError("boom"),
+        },
+    )
+
+    records = stream.request_records(None)
+
+    assert next(records)["id"] == "1"
+    with pytest.raises(RuntimeError, match="boom"):
+        next(records)
+
+
+def test_prefetch_stays_within_prefetch_pages(monkeypatch):
+    stream = get_stream({"prefetch_pages": 1})
+    requested = serve_pages(
+        monkeypatch,
+        stream,
+        {
+            "": make_page(["1"], f"{BASE_URL}/api/v1/alerts?page=2"),
+            "page=2": make_page(["2"], f"{BASE_URL}/api/v1/alerts?page=3"),
+            "page=3": make_page(["3"], None),
+        },
+    )
+    records = stream.request_records(None)
+
+    assert next(records)["id"] == "1"
+    time.sleep(0.3)
+    assert requested == ["", "page=2"]
+    assert [record["id"] for record in records] == ["2", "3"]
+
+
+def test_recorded_pages_replay_offline(monkeypatch, tmp_path):
+    recorder = get_stream(
+        {"replay_mode": "record", "replay_archive_path": str(tmp_path)}
+    )
+    pages = {
+        "": make_page(["1"], f"{BASE_URL}/api/v1/alerts?page=2"),
+        "page=2": make_page(["2"], None),
+    }
+    monkeypatch.setattr(
+        recorder.requests_session,
+        "send",
+        lambda prepared_request, **kwargs: pages[  # noqa: ARG005
+            requests.utils.urlparse(prepared_request.url).query
+        ],
+    )
+    recorded = list(recorder.request_records(None))
+
+    replayer = get_stream(
+        {
+            "api_base_url": "https://elsewhere.example.com",
+            "replay_mode": "replay",
+            "replay_archive_path": str(tmp_path),
+        }
+    )
+    replayed = list(replayer.request_records(None))
+
+    assert replayed == recorded == [{"id": "1"}, {"id": "2"}]
+
+
+def test_repeated_requests_replay_in_order(monkeypatch, tmp_path):
+    config = {
+        "dedup_recheck_head": True,
+        "replay_mode": "record",
+        "replay_archive_path": str(tmp_path),
+    }
+    recorder = get_stream(config)
+    first_pages = [
+        make_page(["1"], f"{BASE_URL}/api/v1/alerts?page=2"),
+        make_page(["0", "1"], f"{BASE_URL}/api/v1/alerts?page=2"),
+    ]
+    monkeypatch.setattr(
+        recorder.requests_session,
+        "send",
+        lambda prepared_request, **kwargs: (  # noqa: ARG005
+            make_page(["2"], None)
+            if requests.utils.urlparse(prepared_request.url).query
+            else first_pages.pop(0)
+        ),
+    )
+    recorded = list(recorder.request_records(None))
+
+    replayer = get_stream({**config, "replay_mode": "replay"})
+    replayed = list(replayer.request_records(None))
+
+    assert [record["id"] for record in recorded] == ["1", "2", "0", "1"]
+    assert replayed == recorded
+
+
+def test_stream_filters_are_pushed_down_or_applied_locally(monkeypatch):
+    stream = get_stream(
+        {
+            "stream_filters": {
+                "oncall_alerts": {"alert_group_id": "G1", "created_at": ["t1", "t2"]}
+            }
+        }
+    )
+    requested = serve_pages(
+        monkeypatch,
+        stream,
+        {
+            "alert_group_id=G1": make_page(["1"], None),
+        },
+    )
+
+    assert list(stream.request_records(None)) == [{"id": "1"}]
+    assert requested == ["alert_group_id=G1"]
+    assert stream.post_process({"id": "1", "created_at": "t2"}) is not None
+    assert stream.post_process({"id": "2", "created_at": "t3"}) is None
+
+
+def test_filters_reject_objects_and_match_unhashable_fields():
+    with pytest.raises(ConfigValidationError):
+        get_stream({"stream_filters": {"oncall_alerts": {"title": {"a": 1}}}})
+
+    stream = get_stream({"stream_filters": {"oncall_alerts": {"created_at": "t1"}}})
+
+    assert stream.post_process({"id": "1", "created_at": {"t": 1}}) is None
+    assert stream.post_process({"id": "2", "created_at": ["t1"]}) is None
+
+
+def test_shifted_pages_are_deduplicated(monkeypatch):
+    stream = get_stream({"dedup_recheck_head": True})
+    requested = serve_pages(
+        monkeypatch,
+        stream,
+        {
+            "": make_page(["3", "2"], f"{BASE_URL}/api/v1/alerts?page=2"),
+            "page=2": make_page(["2", "1"], None),
+        },
+    )
+
+    records = [
+        stream.post_process(record) for record in stream.request_records(None)
+    ]
+
+    assert [record["id"] for record in records if record] == ["3", "2", "1"]
+    assert requested == ["", "page=2", ""]
+
+
+def test_records_without_primary_key_are_not_deduplicated():
+    stream = get_stream()
+
+    records = [stream.post_process({"title": title}) for title in ("a", "b")]
+
+    assert records == [{"title": "a"}, {"title": "b"}]
+
+
+def test_throttled_sync_ends_with_latest_state(monkeypatch, capsys):
+    with pytest.raises(ConfigValidationError):
+        get_stream({"state_message_frequency": 0})
+
+    stream = get_stream(
+        {
+            "state_message_frequency": 1,
+            "state_message_interval": 3600,
+            "custom_streams": [
+                {
+                    "name": "teams",
+                    "path": "/api/v1/teams",
+                    "replication_key": "updated_at",
+                    "schema": {
+                        "properties": {
+                            "id": {"type": "string"},
+                            "updated_at": {"type": "string", "format": "date-time"},
+                        }
+                    },
+                }
+            ],
+        },
+        name="teams",
+    )
+    pages = [
+        make_page(["2024-01-01", "2024-01-02"], f"{BASE_URL}/api/v1/teams?page=2"),
+        make_page(["2024-01-03"], None),
+    ]
+    for page in pages:
+        body = json.loads(page.content)
+        for record in body["results"]:
+            record["updated_at"] = f"{record['id']}T00:00:00Z"
+        page._content = json.dumps(body).encode()  # noqa: SLF001
+    monkeypatch.setattr(stream, "_request", lambda *args: pages.pop(0))  # noqa: ARG005
+
+    stream.sync()
+
+    messages = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    states = [m["value"]["bookmarks"]["teams"] for m in messages if m["type"] == "STATE"]
+    assert len(states) == 2
+    assert states[-1] == {
+        "replication_key": "updated_at",
+        "replication_key_value": "2024-01-03T00:00:00Z",
+    }
+
+
+def test_stream_behind_open_circuit_is_deferred(monkeypatch, capsys):
+    monkeypatch.setattr(resilience, "_breakers", {})
+    failures = {"/api/v1/alerts": 1}
+
+    def fake_send(session, prepared_request, **kwargs):  # noqa: ARG001
+        path = requests.utils.urlparse(prepared_request.url).path
+        if failures.get(path):
+            failures[path] -= 1
+            response = make_page([], None)
+            response.status_code = 503
+            return response
+        return make_page([path], None)
+
+    monkeypatch.setattr(requests.Session, "send", fake_send)
+    tap = TapGrafana(
+        config={
+            "api_key": "key",
+            "api_base_url": BASE_URL,
+            "circuit_breaker_threshold": 1,
+        },
+        parse_env_config=False,
+    )
+    for stream in tap.streams.values():
+        monkeypatch.setattr(stream, "backoff_wait_generator", lambda: backoff.constant(interval=0))
+
+    tap.sync_all()
+
+    messages = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    synced = [m["stream"] for m in messages if m["type"] == "RECORD"]
+    assert synced[-1] == "oncall_alerts"
+    assert len(synced) == len(tap.streams)
+
+
+def test_stalled_request_is_hedged(monkeypatch):
+    stream = get_stream({"hedge_requests": True, "circuit_breaker_threshold": 0})
+    for _ in range(resilience.MIN_LATENCY_SAMPLES):
+        stream.latencies.add(0.01)
+    stalled = threading.Event()
+    release = threading.Event()
+
+    def fake_request(self, prepared_request, context):  # noqa: ARG001
+        if not stalled.is_set():
+            stalled.set()
+            release.wait(timeout=5)
+            return make_page(["primary"], None)
+        return make_page(["hedge"], None)
+
+    monkeypatch.setattr(RESTStream, "_request", fake_request)
+    try:
+        response = stream._request(stream.prepare_request(None, None), None)  # noqa: SLF001
+    finally:
+        release.set()
+
+    assert response.json()["results"] == [{"id": "hedge"}]
+    assert (stream.hedges_sent, stream.hedges_won) == (1, 1)
+
+
+def test_sample_mode_stops_after_sampled_pages(monkeypatch):
+    stream = get_stream({"sample_pages": 1})
+    requested = serve_pages(
+        monkeypatch,
+        stream,
+        {
+            "": make_page(["1", "2"], f"{BASE_URL}/api/v1/alerts?page=2"),
+        },
+    )
+
+    assert [record["id"] for record in stream.request_records(None)] == ["1", "2"]
+    assert requested == [""]
+
+
+@pytest.mark.parametrize("replay_mode", ["record", "replay"])
+def test_sample_estimates_count_records_before_filters(
+    monkeypatch, tmp_path, replay_mode
+):
+    # 1 of the 10 records on each page passes the filter; the API counts 100.
+    page = make_page([str(i) for i in range(10)], None)
+    body = json.loads(page.content)
+    body["count"] = 100
+    body["results"][0]["created_at"] = "keep"
+    page._content = json.dumps(body).encode()  # noqa: SLF001
+    config = {
+        "sample_pages": 1,
+        "stream_filters": {"oncall_alerts": {"created_at": "keep"}},
+        "replay_mode": "record",
+        "replay_archive_path": str(tmp_path),
+    }
+    monkeypatch.setattr(requests.Session, "send", lambda *args, **kwargs: page)  # noqa: ARG005
+    list(get_stream(config).request_records(None))
+
+    stream = get_stream({**config, "replay_mode": replay_mode})
+    stream.sample_stats = SampleStats(stream.schema)
+    for record in stream.request_records(None):
+        stream.post_process(record)
+
+    report = stream.sample_stats.report()
+    assert report["sampled_pages"] == 1
+    assert report["sampled_records"] == 10
+    assert report["emitted_records"] == 1
+    assert report["estimated_pages"] == 10
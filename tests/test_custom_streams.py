@@ -0,0 +1,99 @@
+"""Tests for streams defined in the `custom_streams` setting."""
+
+from __future__ import annotations
+
+import json
+from types import SimpleNamespace
+
+import pytest
+import requests
+from singer_sdk.exceptions import ConfigValidationError
+
+from tap_grafana.client import GrafanaRestStream
+from tap_grafana.grafana_streams import oncall_custom_stream
+from tap_grafana.tap import TapGrafana
+
+SCHEMA = {"type": "object", "properties": {"id": {"type": ["string", "null"]}}}
+
+
+@pytest.fixture()
+def schemas_dir(monkeypatch, tmp_path):
+    """Point the schema cache of custom streams to a temporary directory."""
+    monkeypatch.setattr(
+        oncall_custom_stream,
+        "importlib_resources",
+        SimpleNamespace(files=lambda package: tmp_path),  # noqa: ARG005
+    )
+    return tmp_path
+
+
+def get_custom_stream(**definition):
+    """Return a custom `teams` stream built from ``definition``."""
+    tap = TapGrafana(
+        config={
+            "api_key": "key",
+            "api_base_url": "https://oncall.example.com",
+            "custom_streams": [{"name": "teams", "path": "/api/v1/teams", **definition}],
+        },
+        parse_env_config=False,
+    )
+    return tap.streams["teams"]
+
+
+def test_schema_from_config(schemas_dir):
+    stream = get_custom_stream(schema=SCHEMA, primary_keys=["team_id"])
+
+    assert stream.schema == SCHEMA
+    assert stream.primary_keys == ["team_id"]
+    assert not (schemas_dir / "teams.json").exists()
+
+
+def test_schema_from_cache(schemas_dir):
+    (schemas_dir / "teams.json").write_text(json.dumps(SCHEMA))
+
+    stream = get_custom_stream()
+
+    assert stream.schema == SCHEMA
+    assert stream.primary_keys == ["id"]
+
+
+@pytest.mark.parametrize(
+    ("results", "schema"),
+    [
+        ([{"id": "T1"}], SCHEMA),
+        ([], {"type": "object", "properties": {}}),
+    ],
+)
+def test_schema_inferred_and_cached(monkeypatch, schemas_dir, results, schema):
+    def fake_request(self, prepared_request, context):  # noqa: ARG001
+        response = requests.Response()
+        response.status_code = 200
+        response._content = json.dumps(  # noqa: SLF001
+            {"count": len(results), "next": None, "results": results}
+        ).encode()
+        return response
+
+    monkeypatch.setattr(GrafanaRestStream, "_request", fake_request)
+
+    stream = get_custom_stream()
+
+    assert stream.schema == schema
+    schema_file = schemas_dir / "teams.json"
+    if results:
+        assert json.loads(schema_file.read_text()) == schema
+    else:
+        assert not schema_file.exists()
+
+
+def test_name_of_builtin_stream_is_rejected(schemas_dir):  # noqa: ARG001
+    with pytest.raises(ConfigValidationError, match="oncall_alerts"):
+        TapGrafana(
+            config={
+                "api_key": "key",
+                "api_base_url": "https://oncall.example.com",
+                "custom_streams": [
+                    {"name": "oncall_alerts", "path": "/api/v1/teams", "schema": SCHEMA}
+                ],
+            },
+            parse_env_config=False,
+        )
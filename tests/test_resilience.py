@@ -0,0 +1,23 @@
+"""Tests for the endpoint circuit breaker."""
+
+from __future__ import annotations
+
+import pytest
+
+from tap_grafana.resilience import CircuitBreaker, CircuitOpenError, CircuitState
+
+
+def test_half_open_circuit_lets_one_trial_through():
+    breaker = CircuitBreaker("/api/v1/alerts", failure_threshold=1, reset_timeout=60)
+    breaker.record_failure()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+
+    breaker.allow_trial()
+    breaker.before_request()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+
+    breaker.record_success()
+    assert breaker.state is CircuitState.CLOSED
+    breaker.before_request()
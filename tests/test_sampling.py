@@ -0,0 +1,47 @@
+"""Tests for the sample report of sample runs."""
+
+from __future__ import annotations
+
+import requests
+
+from tap_grafana.sampling import SampleStats
+
+SCHEMA = {"type": "object", "properties": {"id": {"type": "string"}}}
+
+
+def make_response(size: int) -> requests.Response:
+    """Build a page response with a body of ``size`` bytes."""
+    response = requests.Response()
+    response._content = b"x" * size  # noqa: SLF001
+    return response
+
+
+def test_report_extrapolates_from_sampled_pages():
+    stats = SampleStats(SCHEMA)
+    stats.add_page(make_response(1000), 0.5, total_count=100, page_records=10)
+    stats.add_page(make_response(1000), 0.5, total_count=90, page_records=10)
+    stats.add_record({"id": "1"})
+    stats.add_record({"id": 2})
+
+    report = stats.report()
+    projected_seconds = report.pop("projected_seconds")
+
+    assert report == {
+        "sampled_pages": 2,
+        "sampled_records": 20,
+        "emitted_records": 2,
+        "invalid_records": 1,
+        "sampled_bytes": 2000,
+        "mean_request_seconds": 0.5,
+        "estimated_records": 100,
+        "estimated_pages": 10,
+        "estimated_bytes": 10000,
+    }
+    assert projected_seconds >= 0
+
+
+def test_report_without_records_has_no_estimates():
+    stats = SampleStats(SCHEMA)
+    stats.add_page(make_response(10), 0.1, total_count=0, page_records=0)
+
+    assert "estimated_pages" not in stats.report()
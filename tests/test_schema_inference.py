@@ -0,0 +1,28 @@
+"""Tests for schema inference of config-defined streams."""
+
+from tap_grafana.schema_inference import SchemaBuilder
+
+
+def test_types_are_merged_across_records():
+    builder = SchemaBuilder()
+    builder.add({"id": "A1", "count": 1, "created_at": "2024-01-01T00:00:00Z"})
+    builder.add(
+        {"id": "A2", "count": 1.5, "labels": [{"key": "team"}], "extra": None}
+    )
+
+    assert builder.to_schema() == {
+        "type": "object",
+        "properties": {
+            "id": {"type": ["string", "null"]},
+            "count": {"type": ["number", "null"]},
+            "created_at": {"type": ["string", "null"], "format": "date-time"},
+            "labels": {
+                "type": ["array", "null"],
+                "items": {
+                    "type": ["object", "null"],
+                    "properties": {"key": {"type": ["string", "null"]}},
+                },
+            },
+            "extra": {},
+        },
+    }
@@ -0,0 +1,41 @@
+"""Tests for the tap's dry-run mode and command line options."""
+
+from __future__ import annotations
+
+import json
+
+from click.testing import CliRunner
+from singer_sdk._singerlib import RecordMessage
+
+from tap_grafana.tap import TapGrafana
+
+CONFIG = {"api_key": "key", "api_base_url": "https://oncall.example.com"}
+
+
+def test_dry_run_writes_no_messages(capsys):
+    tap = TapGrafana(config={**CONFIG, "dry_run": True}, parse_env_config=False)
+
+    tap.write_message(RecordMessage(stream="oncall_alerts", record={"id": "1"}))
+
+    assert capsys.readouterr().out == ""
+
+
+def test_sample_and_dry_run_options(monkeypatch, tmp_path):
+    monkeypatch.setattr(TapGrafana, "cli_sample_pages", None)
+    monkeypatch.setattr(TapGrafana, "cli_dry_run", False)
+    modes = []
+    monkeypatch.setattr(
+        TapGrafana,
+        "sync_all",
+        lambda tap: modes.append((tap.sample_pages, tap.dry_run)),
+    )
+    config_path = tmp_path / "config.json"
+    config_path.write_text(json.dumps(CONFIG))
+
+    result = CliRunner().invoke(
+        TapGrafana.cli,
+        ["--config", str(config_path), "--sample", "2", "--dry-run"],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert modes == [(2, True)]